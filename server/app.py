@@ -7,18 +7,19 @@ import hashlib
 from functools import wraps
 from datetime import datetime
 from flask import request, jsonify, send_file, session, send_from_directory
-from main import app, db
+from main import app, db, init_db
 from models import GenerationSession, Submission
 from generator import generate_submissions
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.units import inch
+from search import search_submissions
 
 
 ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "devops@graideon.com")
 ADMIN_PASSWORD_HASH = os.environ.get("ADMIN_PASSWORD_HASH")
 
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+# Bump when the session JSON changes shape so browsers drop cached copies
+SESSION_ETAG_VERSION = 1
+
 
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
@@ -154,11 +155,27 @@ def get_sessions():
     } for s in sessions])
 
 
+def set_session_cache_headers(response, etag):
+    # Private because sessions need a login; no-cache so the browser
+    # revalidates (and re-checks the login) before reusing its copy
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
 @app.route('/api/sessions/<int:session_id>', methods=['GET'])
 @login_required
 def get_session(session_id):
     session = GenerationSession.query.get_or_404(session_id)
-    return jsonify({
+
+    # Sessions never change once generated, so the ETag only needs to identify
+    # the row. It is weak because compression changes the bytes on the wire.
+    etag = f"session-v{SESSION_ETAG_VERSION}-{session.id}-{session.created_at.timestamp():.0f}"
+    if request.if_none_match.contains_weak(etag):
+        return set_session_cache_headers(app.response_class(status=304), etag)
+
+    response = jsonify({
         'id': session.id,
         'assignment_title': session.assignment_title,
         'assignment_description': session.assignment_description,
@@ -168,6 +185,46 @@ def get_session(session_id):
         'writing_level': session.writing_level,
         'submissions': [s.to_dict() for s in session.submissions]
     })
+    return set_session_cache_headers(response, etag)
+
+
+@app.route('/api/search', methods=['GET'])
+@login_required
+def search():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Search query is required'}), 400
+
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    min_score = request.args.get('min_score', type=float)
+    max_score = request.args.get('max_score', type=float)
+    session_id = request.args.get('session_id', type=int)
+
+    if page < 1:
+        return jsonify({'error': 'Page must be at least 1'}), 400
+    if per_page < 1 or per_page > 100:
+        return jsonify({'error': 'Results per page must be between 1 and 100'}), 400
+
+    grades = [g.strip().upper() for value in request.args.getlist('grade') for g in value.split(',') if g.strip()]
+
+    result = search_submissions(
+        query=query,
+        page=page,
+        per_page=per_page,
+        grades=grades,
+        min_score=min_score,
+        max_score=max_score,
+        session_id=session_id
+    )
+
+    return jsonify({
+        'query': query,
+        'page': page,
+        'per_page': per_page,
+        'total': result['total'],
+        'results': result['results']
+    })
 
 
 @app.route('/api/export/csv', methods=['POST'])
@@ -225,6 +282,12 @@ def export_json():
 @app.route('/api/export/zip', methods=['POST'])
 @login_required
 def export_zip():
+    # reportlab is only needed for PDF export, so keep it out of worker boot
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.units import inch
+
     try:
         data = request.get_json()
         submissions = data.get('submissions', [])
@@ -319,6 +382,19 @@ def export_zip():
         return jsonify({'error': str(e)}), 500
 
 
+@app.after_request
+def set_asset_cache_headers(response):
+    # Vite puts a content hash in every file name under assets/, so a
+    # changed file always gets a new URL and can be cached forever. 304s need
+    # the same header, or they would replace the cached immutable policy.
+    if request.path.startswith('/assets/') and response.status_code in (200, 304):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = ASSET_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_frontend(path):
@@ -331,4 +407,5 @@ def serve_frontend(path):
 
 
 if __name__ == '__main__':
+    init_db()
     app.run(host='0.0.0.0', port=8000, debug=True)
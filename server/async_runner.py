@@ -0,0 +1,27 @@
+import asyncio
+import threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop():
+    # Created lazily so each gunicorn worker gets its own loop after fork
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='async-runner', daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def run_async(coro):
+    """Run a coroutine on the worker's shared event loop and wait for its result.
+
+    Every request shares one loop rather than calling asyncio.run() itself,
+    because greenlets on the same OS thread cannot each run their own loop.
+    Under gevent workers the loop thread is a greenlet and waiting here only
+    blocks the calling greenlet; under sync workers it is a real thread.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
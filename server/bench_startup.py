@@ -0,0 +1,141 @@
+"""Startup benchmark: import time, time to healthy and per-worker memory.
+
+Usage (from the server directory):
+    python bench_startup.py                 # import timings only
+    python bench_startup.py --gunicorn      # also boot gunicorn with and without preload
+    GUNICORN_WORKER_CLASS=sync python bench_startup.py --gunicorn   # same, with sync workers
+
+Per-worker memory is read from /proc, so the gunicorn part needs Linux.
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_SNIPPET = """
+import resource, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def bench_env():
+    env = dict(os.environ)
+    env.setdefault("SESSION_SECRET", "bench")
+    if not env.get("DATABASE_URL"):
+        db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env["DATABASE_URL"] = f"sqlite:///{db_path}"
+    return env
+
+
+def measure_import(modules, env, runs):
+    times = []
+    rss_kb = 0
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET, *modules],
+            cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(out[0]))
+        rss_kb = int(out[1])
+    return min(times), rss_kb
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def read_memory_kb(pid):
+    memory = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                memory[key] = int(value.split()[0])
+    memory["Private"] = memory.pop("Private_Clean", 0) + memory.pop("Private_Dirty", 0)
+    return memory
+
+
+def worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def bench_gunicorn(env, workers, preload):
+    port = free_port()
+    env = dict(env, GUNICORN_PRELOAD="1" if preload else "0")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", "app:app"],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        ready = None
+        while time.perf_counter() - start < 60:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1)
+                ready = time.perf_counter() - start
+                break
+            except OSError:
+                time.sleep(0.05)
+        if ready is None:
+            raise RuntimeError("gunicorn did not become healthy within 60s")
+
+        # Give the remaining workers time to finish booting
+        deadline = time.perf_counter() + 30
+        while len(worker_pids(proc.pid)) < workers and time.perf_counter() < deadline:
+            time.sleep(0.1)
+        time.sleep(1)
+        return ready, [read_memory_kb(pid) for pid in worker_pids(proc.pid)]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="import runs per measurement (best is reported)")
+    parser.add_argument("--gunicorn", action="store_true", help="also measure gunicorn boot and worker memory")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    env = bench_env()
+    subprocess.run([sys.executable, "-c", "import main; main.init_db()"], cwd=SERVER_DIR, env=env, check=True)
+
+    print("Import time (best of %d) and peak RSS" % args.runs)
+    for label, modules in [
+        ("app (lazy heavy deps)", ["app"]),
+        ("app + google.genai + reportlab", ["app", "google.genai", "reportlab.platypus"]),
+    ]:
+        elapsed, rss_kb = measure_import(modules, env, args.runs)
+        print(f"  {label:<34} {elapsed * 1000:8.1f} ms {rss_kb / 1024:8.1f} MiB")
+
+    if not args.gunicorn:
+        return
+
+    # gunicorn.conf.py picks the worker class; default to it explicitly so it can be reported
+    worker_class = env.setdefault("GUNICORN_WORKER_CLASS", "gevent")
+    print(f"\ngunicorn, {args.workers} {worker_class} workers")
+    for preload in (False, True):
+        ready, workers = bench_gunicorn(env, args.workers, preload)
+        label = "preload" if preload else "no preload"
+        print(f"  {label:<12} healthy after {ready * 1000:.0f} ms")
+        for i, memory in enumerate(workers):
+            print(f"    worker {i}: RSS {memory['Rss'] / 1024:6.1f} MiB  "
+                  f"PSS {memory['Pss'] / 1024:6.1f} MiB  private {memory['Private'] / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,50 @@
 import os
 import json
 import random
+import asyncio
 import logging
 from typing import Optional
-from google import genai
-from google.genai import types
+
+from async_runner import run_async
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+GEMINI_MODEL = "gemini-2.5-flash"
+# Model calls one generation request keeps in flight at once in async mode
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+
+_ssl_context = None
+
+
+def get_ssl_context():
+    # Loading the CA bundle is most of the cost of building a client, so share one
+    global _ssl_context
+    if _ssl_context is None:
+        import ssl
+        import certifi
+        _ssl_context = ssl.create_default_context(
+            cafile=os.environ.get('SSL_CERT_FILE', certifi.where()),
+            capath=os.environ.get('SSL_CERT_DIR')
+        )
+    return _ssl_context
+
+
 def get_gemini_client():
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_API_KEY environment variable is not set. Please configure your Google API key.")
-    return genai.Client(api_key=api_key)
+    # Imported on first use: google.genai is slow to import and only needed for generation
+    from google import genai
+    from google.genai import types
+    ssl_context = get_ssl_context()
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            client_args={'verify': ssl_context},
+            async_client_args={'verify': ssl_context, 'ssl': ssl_context}
+        )
+    )
 
 FIRST_NAMES = [
     "Emma", "Liam", "Olivia", "Noah", "Ava", "Ethan", "Sophia", "Mason",
@@ -106,17 +137,16 @@ def parse_rubric(rubric_text: str) -> list:
     return criteria[:10]
 
 
-def generate_submission_with_gemini(
+def build_submission_prompt(
     assignment_title: str,
     assignment_description: str,
-    rubric_text: Optional[str],
     grade: str,
     score: int,
     writing_level: str,
     variation_level: str,
     student_name: str,
     rubric_criteria: list
-) -> dict:
+) -> str:
     variation_instructions = {
         'low': 'Write in a consistent, standard style.',
         'medium': 'Include some personal voice and moderate stylistic variation.',
@@ -155,26 +185,44 @@ Write the student's submission for this assignment. The submission should:
 
 IMPORTANT: Write ONLY the student's submission text. Do not include any meta-commentary, labels, or explanations."""
 
+    return prompt
+
+
+async def generate_submission_with_gemini_async(
+    client,
+    assignment_title: str,
+    assignment_description: str,
+    grade: str,
+    score: int,
+    writing_level: str,
+    variation_level: str,
+    student_name: str,
+    rubric_criteria: list
+) -> str:
+    prompt = build_submission_prompt(
+        assignment_title, assignment_description, grade, score,
+        writing_level, variation_level, student_name, rubric_criteria
+    )
+
     try:
-        client = get_gemini_client()
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
+        response = await client.aio.models.generate_content(
+            model=GEMINI_MODEL,
             contents=prompt
         )
         submission_text = response.text if response.text else "Error generating submission."
     except Exception as e:
         logger.error(f"Gemini API error: {e}")
-        submission_text = f"[Error generating submission: {str(e)}]"
-    
+        submission_text = get_error_submission_text(e)
+
     return submission_text
 
 
-def generate_feedback_with_gemini(
+def build_feedback_prompt(
     submission_text: str,
     grade: str,
     score: int,
     rubric_criteria: list
-) -> tuple:
+) -> str:
     rubric_request = ""
     if rubric_criteria:
         rubric_request = f"""
@@ -198,25 +246,42 @@ Provide feedback in JSON format with these fields:
 
 Respond with valid JSON only."""
 
+    return prompt
+
+
+def parse_feedback_response(response_text: Optional[str]) -> tuple:
+    result = json.loads(response_text) if response_text else {}
+    feedback = result.get('feedback', 'Good effort on this assignment.')
+    rubric_scores = result.get('rubric_scores', None)
+    return feedback, rubric_scores
+
+
+async def generate_feedback_with_gemini_async(
+    client,
+    submission_text: str,
+    grade: str,
+    score: int,
+    rubric_criteria: list
+) -> tuple:
+    prompt = build_feedback_prompt(submission_text, grade, score, rubric_criteria)
+
     try:
-        client = get_gemini_client()
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
+        from google.genai import types
+        response = await client.aio.models.generate_content(
+            model=GEMINI_MODEL,
             contents=prompt,
             config=types.GenerateContentConfig(
                 response_mime_type="application/json"
             )
         )
-        
-        result = json.loads(response.text) if response.text else {}
-        feedback = result.get('feedback', 'Good effort on this assignment.')
-        rubric_scores = result.get('rubric_scores', None)
-        
+
+        feedback, rubric_scores = parse_feedback_response(response.text)
+
     except Exception as e:
         logger.error(f"Feedback generation error: {e}")
-        feedback = f"Grade: {grade}. {get_fallback_feedback(grade)}"
+        feedback = get_fallback_feedback(grade)
         rubric_scores = None
-    
+
     return feedback, rubric_scores
 
 
@@ -228,7 +293,46 @@ def get_fallback_feedback(grade: str) -> str:
         'D': 'Your submission needs improvement. Focus on addressing all aspects of the assignment.',
         'F': 'This submission does not meet the assignment requirements. Please review the instructions and seek help.'
     }
-    return feedback_templates.get(grade, 'Please review your submission.')
+    return f"Grade: {grade}. {feedback_templates.get(grade, 'Please review your submission.')}"
+
+
+def get_error_submission_text(error: Exception) -> str:
+    return f"[Error generating submission: {str(error)}]"
+
+
+def plan_students(num_students: int, grade_distribution: str) -> list:
+    grades = assign_grades(num_students, grade_distribution)
+    used_names = set()
+    students = []
+    
+    for i in range(num_students):
+        student_name = generate_student_name()
+        while student_name in used_names:
+            student_name = generate_student_name()
+        used_names.add(student_name)
+        
+        grade = grades[i]
+        students.append({
+            'id': f"STU{str(i+1).zfill(4)}",
+            'student_name': student_name,
+            'grade': grade,
+            'total_score': get_score_for_grade(grade)
+        })
+    
+    return students
+
+
+def build_submission(student: dict, submission_text: str, feedback: str, rubric_scores) -> dict:
+    return {
+        'id': student['id'],
+        'student_name': student['student_name'],
+        'grade': student['grade'],
+        'total_score': student['total_score'],
+        'submission_text': submission_text,
+        'feedback': feedback,
+        'rubric_scores': rubric_scores,
+        'word_count': len(submission_text.split())
+    }
 
 
 def generate_submissions(
@@ -240,56 +344,71 @@ def generate_submissions(
     writing_level: str,
     variation_level: str = 'medium'
 ) -> list:
+    """Blocking wrapper around generate_submissions_async for request handlers."""
+    return run_async(generate_submissions_async(
+        assignment_title, assignment_description, rubric, num_students,
+        grade_distribution, writing_level, variation_level
+    ))
+
+
+async def generate_submissions_async(
+    assignment_title: str,
+    assignment_description: str,
+    rubric: Optional[str],
+    num_students: int,
+    grade_distribution: str,
+    writing_level: str,
+    variation_level: str = 'medium'
+) -> list:
+    """Generate submissions and feedback for every student concurrently.
+
+    Each student's submission and feedback calls still run in order, with at
+    most GEMINI_MAX_CONCURRENCY students in flight at once.
+    """
     num_students = max(1, min(50, num_students))
     
-    grades = assign_grades(num_students, grade_distribution)
+    students = plan_students(num_students, grade_distribution)
     rubric_criteria = parse_rubric(rubric) if rubric else []
+    semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
     
-    used_names = set()
-    submissions = []
+    # One client per request keeps each connection pool small; httpx pool
+    # bookkeeping gets slow when hundreds of calls share one pool
+    try:
+        client = get_gemini_client()
+    except ValueError as e:
+        # No API key: return placeholders, just as when every model call fails
+        logger.error(f"Gemini API error: {e}")
+        return [
+            build_submission(student, get_error_submission_text(e), get_fallback_feedback(student['grade']), None)
+            for student in students
+        ]
     
-    for i in range(num_students):
-        student_name = generate_student_name()
-        while student_name in used_names:
-            student_name = generate_student_name()
-        used_names.add(student_name)
-        
-        grade = grades[i]
-        score = get_score_for_grade(grade)
-        student_id = f"STU{str(i+1).zfill(4)}"
-        
-        submission_text = generate_submission_with_gemini(
-            assignment_title=assignment_title,
-            assignment_description=assignment_description,
-            rubric_text=rubric,
-            grade=grade,
-            score=score,
-            writing_level=writing_level,
-            variation_level=variation_level,
-            student_name=student_name,
-            rubric_criteria=rubric_criteria
-        )
-        
-        feedback, rubric_scores = generate_feedback_with_gemini(
-            submission_text=submission_text,
-            grade=grade,
-            score=score,
-            rubric_criteria=rubric_criteria
-        )
-        
-        word_count = len(submission_text.split())
-        
-        submissions.append({
-            'id': student_id,
-            'student_name': student_name,
-            'grade': grade,
-            'total_score': score,
-            'submission_text': submission_text,
-            'feedback': feedback,
-            'rubric_scores': rubric_scores,
-            'word_count': word_count
-        })
+    async def generate_one(student: dict) -> dict:
+        async with semaphore:
+            submission_text = await generate_submission_with_gemini_async(
+                client,
+                assignment_title=assignment_title,
+                assignment_description=assignment_description,
+                grade=student['grade'],
+                score=student['total_score'],
+                writing_level=writing_level,
+                variation_level=variation_level,
+                student_name=student['student_name'],
+                rubric_criteria=rubric_criteria
+            )
+            
+            feedback, rubric_scores = await generate_feedback_with_gemini_async(
+                client,
+                submission_text=submission_text,
+                grade=student['grade'],
+                score=student['total_score'],
+                rubric_criteria=rubric_criteria
+            )
         
-        logger.info(f"Generated submission {i+1}/{num_students} for {student_name} (Grade: {grade})")
+        logger.info(f"Generated submission {student['id']} for {student['student_name']} (Grade: {student['grade']})")
+        return build_submission(student, submission_text, feedback, rubric_scores)
     
-    return submissions
+    try:
+        return await asyncio.gather(*(generate_one(student) for student in students))
+    finally:
+        await client.aio.aclose()
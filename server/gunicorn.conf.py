@@ -0,0 +1,34 @@
+import gc
+import os
+
+# gevent workers serve each request in a greenlet, so one process can keep
+# hundreds of slow Gemini calls in flight and still answer /api/health.
+# Set GUNICORN_WORKER_CLASS=sync to fall back to one request per worker.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+if worker_class == "gevent":
+    # Patch before the app (and ssl, sqlalchemy, ...) are imported in the master
+    from gevent import monkey
+    monkey.patch_all()
+    # psycopg2 is a C extension, so it needs its own hook to yield while waiting on Postgres
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+# Set GUNICORN_PRELOAD=1 to load the app once in the master process and fork
+# workers from it, so they share its memory copy-on-write.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "").lower() in ("1", "true", "yes")
+
+
+def on_starting(server):
+    # Schema creation runs once in the master, not in every worker
+    from main import init_db
+    init_db()
+
+    if preload_app:
+        # Heavy dependencies are normally imported on first use. When
+        # preloading, import them here so every worker shares one copy.
+        import google.genai  # noqa: F401
+        import reportlab.platypus  # noqa: F401
+        # Keep the garbage collector from touching (and so copying) shared pages
+        gc.freeze()
@@ -0,0 +1,194 @@
+"""Load test: is /api/health still responsive while generations are in flight?
+
+Starts a stub Gemini API that answers every call after a fixed delay, then a
+single gunicorn worker pointed at it. While many generation requests are
+running, /api/health is polled and its latency reported.
+
+Usage (from the server directory):
+    python load_test.py                              # gevent worker (the default)
+    GUNICORN_WORKER_CLASS=sync python load_test.py   # compare with a sync worker
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+PASSWORD = "load-test"
+
+
+class StubGemini(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency):
+        super().__init__(("127.0.0.1", 0), StubGeminiHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.in_flight += 1
+            server.calls += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency)
+            # Valid JSON so the same reply also works for feedback calls
+            text = json.dumps({"feedback": "Solid effort with a clear argument. " * 3})
+            body = json.dumps({
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}]
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def post_json(url, payload, cookie=None, timeout=600):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST",
+                                 headers={"Content-Type": "application/json"})
+    if cookie:
+        req.add_header("Cookie", cookie)
+    return urllib.request.urlopen(req, timeout=timeout)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="concurrent generation requests")
+    parser.add_argument("--students", type=int, default=5, help="students per generation request")
+    parser.add_argument("--latency", type=float, default=5.0, help="seconds the stub takes per model call")
+    parser.add_argument("--health-interval", type=float, default=0.1)
+    args = parser.parse_args()
+
+    stub = StubGemini(args.latency)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        SESSION_SECRET="load-test",
+        DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}",
+        ADMIN_EMAIL="load@test.local",
+        ADMIN_PASSWORD_HASH=hashlib.sha256(PASSWORD.encode()).hexdigest(),
+        GOOGLE_API_KEY="load-test",
+        GOOGLE_GEMINI_BASE_URL=f"http://127.0.0.1:{stub.server_address[1]}",
+    )
+    worker_class = env.setdefault("GUNICORN_WORKER_CLASS", "gevent")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-w", "1", "-b", f"127.0.0.1:{port}", "--timeout", "600", "app:app"],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        deadline = time.time() + 60
+        while True:
+            try:
+                urllib.request.urlopen(f"{base}/api/health", timeout=1)
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise RuntimeError("server did not start")
+                time.sleep(0.1)
+
+        login = post_json(f"{base}/api/auth/login", {"email": "load@test.local", "password": PASSWORD})
+        cookie = login.headers["Set-Cookie"].split(";", 1)[0]
+
+        payload = {
+            "assignment_title": "Load test essay",
+            "assignment_description": "Discuss the causes and consequences of the industrial revolution.",
+            "num_students": args.students,
+        }
+
+        def generate(_):
+            start = time.time()
+            try:
+                with post_json(f"{base}/api/generate_submissions", payload, cookie) as resp:
+                    ok = len(json.load(resp)["submissions"]) == args.students
+            except (urllib.error.URLError, OSError, KeyError):
+                ok = False
+            return ok, time.time() - start
+
+        health_latencies = []
+        health_failures = 0
+        done = threading.Event()
+
+        def poll_health():
+            nonlocal health_failures
+            while not done.is_set():
+                start = time.time()
+                try:
+                    urllib.request.urlopen(f"{base}/api/health", timeout=10).read()
+                    health_latencies.append(time.time() - start)
+                except OSError:
+                    health_failures += 1
+                time.sleep(args.health_interval)
+
+        poller = threading.Thread(target=poll_health)
+        started = time.time()
+        with ThreadPoolExecutor(args.requests) as pool:
+            results = pool.map(generate, range(args.requests))
+            # Start polling once the generation requests are queued
+            time.sleep(0.5)
+            poller.start()
+            results = list(results)
+        done.set()
+        poller.join()
+        elapsed = time.time() - started
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+        stub.shutdown()
+
+    succeeded = sum(ok for ok, _ in results)
+    print(f"worker class:             {worker_class} (1 worker)")
+    print(f"generation requests:      {succeeded}/{args.requests} succeeded in {elapsed:.1f}s "
+          f"({args.students} students each, {args.latency:.1f}s per model call)")
+    print(f"model calls:              {stub.calls} total, peak {stub.peak_in_flight} in flight")
+    if health_latencies:
+        print(f"/api/health latency:      p50 {percentile(health_latencies, 50) * 1000:.1f} ms  "
+              f"p99 {percentile(health_latencies, 99) * 1000:.1f} ms  "
+              f"max {max(health_latencies) * 1000:.1f} ms  ({len(health_latencies)} checks)")
+    print(f"/api/health failures:     {health_failures}")
+
+
+if __name__ == "__main__":
+    main()
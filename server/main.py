@@ -2,6 +2,7 @@ import os
 from flask import Flask, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from flask_compress import Compress
 from sqlalchemy.orm import DeclarativeBase
 from datetime import timedelta
 
@@ -32,6 +33,21 @@ if os.environ.get("RAILWAY_PUBLIC_DOMAIN"):
 
 CORS(app, supports_credentials=True, origins=[o for o in allowed_origins if o])
 
+# Session JSON and exports are mostly essay text and compress very well
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+# send_file responses (exports, static assets) are streamed
+app.config["COMPRESS_ALGORITHM_STREAMING"] = ["br", "gzip"]
+app.config["COMPRESS_MIMETYPES"] = [
+    "text/html",
+    "text/css",
+    "text/csv",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+]
+Compress(app)
+
 session_secret = os.environ.get("SESSION_SECRET")
 if not session_secret:
     raise ValueError("SESSION_SECRET environment variable is required for secure sessions")
@@ -48,13 +64,30 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
 
 db.init_app(app)
 
-with app.app_context():
+
+def init_db():
+    """Create tables and the search index. Run once per deploy, not per worker."""
     import models  # noqa: F401
-    db.create_all()
+    from search import setup_search_index
+    with app.app_context():
+        db.create_all()
+        setup_search_index()
+        # Don't hand pooled connections to forked gunicorn workers
+        db.engine.dispose()
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables and the full-text search index."""
+    init_db()
+    print("Database initialized.")
+
 
 if __name__ == '__main__':
-    # Import app.py to register all API routes
-    import app as app_routes  # noqa: F401
+    # Import app.py to register all API routes. It imports this file as
+    # `main`, so use its app and db rather than the ones defined in __main__.
+    import app as app_routes
+    app_routes.init_db()
     # Run Flask on port 8000 for development
     # Frontend Vite dev server runs on port 5000 and proxies /api requests here
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    app_routes.app.run(host='0.0.0.0', port=8000, debug=True)
@@ -0,0 +1,248 @@
+import html
+import re
+from sqlalchemy import text
+from main import db
+
+
+# Stored text is escaped before highlighting, so the database marks matches
+# with control characters that cannot appear in escaped HTML
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_WORDS = 24
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def setup_search_index():
+    """Create the full-text index over submission text and feedback.
+
+    SQLite uses an external-content FTS5 table kept in sync by triggers;
+    PostgreSQL uses a stored generated tsvector column with a GIN index,
+    which the database keeps current on every insert and update.
+    """
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        _setup_sqlite_index()
+    elif dialect == 'postgresql':
+        _setup_postgres_index()
+
+
+def _setup_sqlite_index():
+    with db.engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'submissions_fts'"
+        )).first()
+
+        conn.execute(text("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS submissions_fts USING fts5(
+                submission_text, feedback,
+                content='submissions', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS submissions_fts_insert AFTER INSERT ON submissions BEGIN
+                INSERT INTO submissions_fts(rowid, submission_text, feedback)
+                VALUES (new.id, new.submission_text, new.feedback);
+            END
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS submissions_fts_delete AFTER DELETE ON submissions BEGIN
+                INSERT INTO submissions_fts(submissions_fts, rowid, submission_text, feedback)
+                VALUES ('delete', old.id, old.submission_text, old.feedback);
+            END
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS submissions_fts_update AFTER UPDATE ON submissions BEGIN
+                INSERT INTO submissions_fts(submissions_fts, rowid, submission_text, feedback)
+                VALUES ('delete', old.id, old.submission_text, old.feedback);
+                INSERT INTO submissions_fts(rowid, submission_text, feedback)
+                VALUES (new.id, new.submission_text, new.feedback);
+            END
+        """))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_submissions_session_id ON submissions (session_id)"
+        ))
+
+        if not exists:
+            # Index submissions stored before the FTS table existed
+            conn.execute(text("INSERT INTO submissions_fts(submissions_fts) VALUES ('rebuild')"))
+
+
+def _setup_postgres_index():
+    with db.engine.begin() as conn:
+        conn.execute(text("""
+            ALTER TABLE submissions ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(submission_text, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(feedback, '')), 'B')
+            ) STORED
+        """))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_submissions_search_vector ON submissions USING GIN (search_vector)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_submissions_session_id ON submissions (session_id)"
+        ))
+
+
+def _build_filters(grades, min_score, max_score, session_id):
+    clauses = []
+    params = {}
+
+    if grades:
+        names = []
+        for i, grade in enumerate(grades):
+            params[f'grade_{i}'] = grade
+            names.append(f':grade_{i}')
+        clauses.append(f"s.grade IN ({', '.join(names)})")
+    if min_score is not None:
+        clauses.append("s.total_score >= :min_score")
+        params['min_score'] = min_score
+    if max_score is not None:
+        clauses.append("s.total_score <= :max_score")
+        params['max_score'] = max_score
+    if session_id is not None:
+        clauses.append("s.session_id = :session_id")
+        params['session_id'] = session_id
+
+    sql = ''.join(f" AND {clause}" for clause in clauses)
+    return sql, params
+
+
+def _fts5_query(query: str) -> str:
+    """Translate web-search syntax into an FTS5 query.
+
+    Matches PostgreSQL's websearch_to_tsquery: plain words must all match,
+    "quoted phrases" match in order, ``or`` matches either side and ``-term``
+    excludes a term. Every term is quoted, so user input can never be parsed
+    as raw FTS5 syntax.
+    """
+    groups = [[]]
+    for token in re.findall(r'-?"[^"]*"?|\S+', query):
+        if token.lower() == 'or':
+            groups.append([])
+            continue
+        negated = token.startswith('-') and len(token) > 1
+        words = re.findall(r'\w+', token)
+        if words:
+            groups[-1].append((negated, '"' + ' '.join(words) + '"'))
+
+    clauses = []
+    for group in groups:
+        include = [term for negated, term in group if not negated]
+        exclude = [term for negated, term in group if negated]
+        # FTS5's NOT needs a left-hand side, so a group of only exclusions is dropped
+        if include:
+            clauses.append('(' + ' '.join(include) + ''.join(f' NOT {term}' for term in exclude) + ')')
+    return ' OR '.join(clauses)
+
+
+def _highlight(snippet):
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+
+
+def search_submissions(
+    query: str,
+    page: int = 1,
+    per_page: int = 20,
+    grades=None,
+    min_score=None,
+    max_score=None,
+    session_id=None
+) -> dict:
+    """Return one page of submissions matching ``query``, best match first."""
+    filters, params = _build_filters(grades, min_score, max_score, session_id)
+    params['limit'] = per_page
+    params['offset'] = (page - 1) * per_page
+
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        params['query'] = _fts5_query(query)
+        if not params['query']:
+            return {'total': 0, 'results': []}
+        snippet_params = {'snippet_start': SNIPPET_START, 'snippet_end': SNIPPET_END}
+        # Only join submissions when filtering on it; FTS5 counts much faster alone
+        join = "JOIN submissions s ON s.id = submissions_fts.rowid" if filters else ""
+        count_sql = f"""
+            SELECT COUNT(*) FROM submissions_fts
+            {join}
+            WHERE submissions_fts MATCH :query{filters}
+        """
+        # Rank and page first, then build snippets only for the rows on this page
+        results_sql = f"""
+            WITH hits AS (
+                SELECT submissions_fts.rowid AS id, bm25(submissions_fts, 2.0, 1.0) AS rank
+                FROM submissions_fts
+                {join}
+                WHERE submissions_fts MATCH :query{filters}
+                ORDER BY rank
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT s.id, s.session_id, s.student_id, s.student_name, s.grade,
+                   s.total_score, s.word_count,
+                   snippet(submissions_fts, 0, :snippet_start, :snippet_end, '…', {SNIPPET_WORDS}) AS text_snippet,
+                   snippet(submissions_fts, 1, :snippet_start, :snippet_end, '…', {SNIPPET_WORDS}) AS feedback_snippet,
+                   -hits.rank AS rank
+            FROM hits
+            JOIN submissions_fts ON submissions_fts.rowid = hits.id
+            JOIN submissions s ON s.id = hits.id
+            WHERE submissions_fts MATCH :query
+            ORDER BY hits.rank
+        """
+    elif dialect == 'postgresql':
+        params['query'] = query
+        snippet_params = {
+            'headline_options': (
+                f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, "
+                f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=1"
+            )
+        }
+        count_sql = f"""
+            SELECT COUNT(*) FROM submissions s
+            WHERE s.search_vector @@ websearch_to_tsquery('english', :query){filters}
+        """
+        # Headlines are expensive, so only build them for the rows on this page
+        results_sql = f"""
+            WITH hits AS (
+                SELECT s.id, s.session_id, s.student_id, s.student_name, s.grade,
+                       s.total_score, s.word_count, s.submission_text, s.feedback,
+                       ts_rank(s.search_vector, q) AS rank, q
+                FROM submissions s, websearch_to_tsquery('english', :query) q
+                WHERE s.search_vector @@ q{filters}
+                ORDER BY rank DESC, s.id DESC
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT id, session_id, student_id, student_name, grade, total_score, word_count,
+                   ts_headline('english', submission_text, q, :headline_options) AS text_snippet,
+                   ts_headline('english', feedback, q, :headline_options) AS feedback_snippet,
+                   rank
+            FROM hits
+            ORDER BY rank DESC, id DESC
+        """
+    else:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+
+    count_params = {k: v for k, v in params.items() if k not in ('limit', 'offset')}
+    total = db.session.execute(text(count_sql), count_params).scalar()
+    rows = db.session.execute(text(results_sql), {**params, **snippet_params}).mappings().all()
+
+    return {
+        'total': total,
+        'results': [{
+            'submission_id': row['id'],
+            'session_id': row['session_id'],
+            'id': row['student_id'],
+            'student_name': row['student_name'],
+            'grade': row['grade'],
+            'total_score': row['total_score'],
+            'word_count': row['word_count'],
+            'text_snippet': _highlight(row['text_snippet']),
+            'feedback_snippet': _highlight(row['feedback_snippet']),
+            'rank': float(row['rank'])
+        } for row in rows]
+    }